@@ -6,53 +6,306 @@ Monitors an RSS feed and converts new posts into EPUB files.
 
 import os
 import sys
+import functools
 import hashlib
 import html
+import io
+import re
+import sqlite3
 import time
-import feedparser
-from ebooklib import epub
-from bs4 import BeautifulSoup
+from urllib.parse import unquote_plus, urlsplit
+
+# asyncio, feedparser, aiohttp, ebooklib, lxml and selectolax are imported where they are used, so that
+# printing usage or argument errors does not pay for loading them
+
+
+# Matches anything that looks like a tag, comment or doctype
+_MARKUP_RE = re.compile(r'<[A-Za-z!/?]')
+
+# Filename sanitizing: spaces become underscores, anything that is not
+# alphanumeric, a hyphen or an underscore is dropped
+_SPACE_TO_UNDERSCORE = str.maketrans(' ', '_')
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w-]')
+
+# Content types that feedparser runs through its HTML sanitizer
+_SANITIZED_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Tags that lxml's Cleaner leaves untouched, so content made only of these
+# (with safe attributes) can skip the Cleaner entirely
+_PLAIN_CONTENT_TAGS = frozenset((
+    'a', 'abbr', 'b', 'blockquote', 'body', 'br', 'caption', 'cite', 'code',
+    'dd', 'del', 'div', 'dl', 'dt', 'em', 'figcaption', 'figure', 'h1', 'h2',
+    'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'ins', 'li', 'ol', 'p', 'pre',
+    'q', 's', 'small', 'span', 'strong', 'sub', 'sup', 'table', 'tbody', 'td',
+    'tfoot', 'th', 'thead', 'tr', 'u', 'ul',
+))
+
+# Link schemes allowed on the fast path; relative URLs have no scheme
+_SAFE_URL_SCHEMES = frozenset(('', 'http', 'https', 'mailto'))
+
+# Same normalization and scheme list lxml's Cleaner uses to blank script links
+_URL_NOISE_RE = re.compile(r'[\s\x00-\x08\x0B\x0C\x0E-\x19]+')
+_UNSAFE_SCHEME_RE = re.compile(r'(javascript|jscript|livescript|vbscript|data|about|mocha):', re.I)
+
+# History file older versions shared between all feeds in single-feed mode
+LEGACY_SHARED_HISTORY_FILE = 'seen_posts.txt'
+
+# Feed key for post IDs that count as seen for every feed
+SHARED_HISTORY_FEED = ''
+
+# Maximum number of feeds downloaded at the same time
+MAX_CONCURRENT_FETCHES = 8
+
+# Seconds to wait for a feed server before giving up on a fetch
+FEED_REQUEST_TIMEOUT = 30
+
+# DEFLATE level for EPUB archives; single chapters gain little from higher
+# levels, which cost noticeably more CPU
+EPUB_COMPRESS_LEVEL = 1
+
+
+@functools.lru_cache(maxsize=4096)
+def _id_hash(value):
+    """Return a short, stable hash of a post ID or feed URL."""
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()[:16]
+
+
+def _create_http_session():
+    """
+    Create an HTTP session that keeps connections to feed servers alive.
+    
+    Must be called from a running event loop.
+    """
+    import aiohttp
+    import feedparser
+    
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=MAX_CONCURRENT_FETCHES),
+        # Per-socket limits rather than a total, so time spent queued for a
+        # free connection does not count against a feed's timeout
+        timeout=aiohttp.ClientTimeout(
+            sock_connect=FEED_REQUEST_TIMEOUT,
+            sock_read=FEED_REQUEST_TIMEOUT,
+        ),
+        # Identify like feedparser does, some servers reject unknown clients
+        headers={
+            'User-Agent': feedparser.USER_AGENT,
+            'Accept': feedparser.http.ACCEPT_HEADER,
+        },
+    )
+
+
+def _is_safe_link(url):
+    """Check that a link attribute is one lxml's Cleaner would leave unchanged."""
+    url = _URL_NOISE_RE.sub('', unquote_plus(url))
+    if _UNSAFE_SCHEME_RE.search(url):
+        return False
+    return urlsplit(url).scheme.lower() in _SAFE_URL_SCHEMES
+
+
+@functools.lru_cache(maxsize=1024)
+def _escape_title(title):
+    """HTML-escape a post title, returning it unchanged if nothing needs escaping."""
+    if any(c in title for c in '<>&"\''):
+        return html.escape(title)
+    return title
+
+
+@functools.lru_cache(maxsize=None)
+def _html_cleaner():
+    """Return the cleaner used for content feedparser did not sanitize."""
+    from lxml.html.clean import Cleaner
+    # Strips scripts and other unsafe markup
+    return Cleaner(scripts=True, javascript=True)
+
+
+class PostHistory:
+    """SQLite-backed record of processed post IDs, shared by all feeds."""
+    
+    def __init__(self, db_file='seen.db'):
+        """
+        Open (and create if needed) the history database.
+        
+        Args:
+            db_file: Path to the SQLite database file
+        """
+        self.db_file = db_file
+        self._conn = sqlite3.connect(db_file, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen ('
+            'feed TEXT NOT NULL, post_id TEXT NOT NULL, '
+            'PRIMARY KEY (feed, post_id)) WITHOUT ROWID'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS feeds ('
+            'feed TEXT PRIMARY KEY, etag TEXT, modified TEXT)'
+        )
+    
+    def contains(self, feed, post_id):
+        """Check whether a post of the given feed, or a shared one, has been processed."""
+        row = self._conn.execute(
+            'SELECT 1 FROM seen WHERE feed IN (?, ?) AND post_id = ? LIMIT 1',
+            (feed, SHARED_HISTORY_FEED, post_id)
+        ).fetchone()
+        return row is not None
+    
+    def add(self, feed, post_ids):
+        """Record post IDs of the given feed as processed, in a single transaction."""
+        self._conn.execute('BEGIN')
+        try:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO seen (feed, post_id) VALUES (?, ?)',
+                ((feed, post_id) for post_id in post_ids)
+            )
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._conn.execute('COMMIT')
+    
+    def get_validators(self, feed):
+        """Return the (etag, modified) HTTP cache validators stored for a feed."""
+        row = self._conn.execute(
+            'SELECT etag, modified FROM feeds WHERE feed = ?',
+            (feed,)
+        ).fetchone()
+        return row if row is not None else (None, None)
+    
+    def set_validators(self, feed, etag, modified):
+        """Store the HTTP cache validators of the last successful feed fetch."""
+        self._conn.execute(
+            'INSERT OR REPLACE INTO feeds (feed, etag, modified) VALUES (?, ?, ?)',
+            (feed, etag, modified)
+        )
+    
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
 
 
 class RSSToEpubConverter:
     """Converts RSS feed posts to EPUB files."""
     
-    def __init__(self, rss_url, history_file='seen_posts.txt', output_dir='output'):
+    def __init__(self, rss_url, history_file=LEGACY_SHARED_HISTORY_FILE, output_dir='output',
+                 history=None):
         """
         Initialize the converter.
         
         Args:
             rss_url: URL of the RSS feed to monitor
-            history_file: Path to file tracking seen post IDs
+            history_file: Legacy text file of seen post IDs, imported into the
+                history database if it exists
             output_dir: Directory to save EPUB files to
+            history: Shared PostHistory instance (a private one using seen.db
+                is opened if not given)
         """
         self.rss_url = rss_url
         self.history_file = history_file
         self.output_dir = output_dir
-        self.seen_posts = self._load_history()
+        self._owns_history = history is None
+        self.history = PostHistory() if history is None else history
+        self._import_legacy_history()
+        # ETag / Last-Modified of the last fetch, used for conditional requests
+        self._etag, self._modified = self.history.get_validators(rss_url)
         
         # Create output directory if it doesn't exist
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Output shard directories already created by this converter
+        self._known_dirs = set()
     
-    def _load_history(self):
-        """Load the history of seen post IDs from file."""
-        if not os.path.exists(self.history_file):
-            return set()
+    def _import_legacy_history(self):
+        """Import seen post IDs from an old text history file into the database."""
+        # Decode the whole file at once instead of line by line
+        try:
+            with open(self.history_file, 'rb') as f:
+                data = f.read().decode('utf-8')
+        except FileNotFoundError:
+            return
+        post_ids = set(line.strip() for line in data.split('\n')) - {''}
+        # The shared file mixed IDs from every feed run in single-feed mode, so
+        # they must keep suppressing duplicates for all feeds, not just this one
+        if self.history_file == LEGACY_SHARED_HISTORY_FILE:
+            feed = SHARED_HISTORY_FEED
+        else:
+            feed = self.rss_url
+        self.history.add(feed, post_ids)
         
-        with open(self.history_file, 'r', encoding='utf-8') as f:
-            return set(line.strip() for line in f if line.strip())
+        # Rename rather than delete so the import only happens once
+        os.replace(self.history_file, f"{self.history_file}.migrated")
+        print(f"Imported {len(post_ids)} post ID(s) from '{self.history_file}'")
     
-    def _save_post_id(self, post_id):
-        """Save a new post ID to the history file."""
-        with open(self.history_file, 'a', encoding='utf-8') as f:
-            f.write(f"{post_id}\n")
-            f.flush()  # Ensure data is written to disk immediately
+    def close(self):
+        """Close the history database if this converter opened it."""
+        if self._owns_history:
+            self.history.close()
     
-    def _clean_html_content(self, html_content):
-        """Clean and extract text from HTML content."""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        return str(soup)
+    def _clean_html_content(self, html_content, sanitized=False):
+        """
+        Clean and extract text from HTML content.
+        
+        Args:
+            html_content: HTML (or plain text) content of the post
+            sanitized: True if feedparser has already sanitized the content
+        """
+        if not html_content:
+            return ''
+        
+        # Plain text: unescape/escape matches what a parse round-trip would do
+        if not _MARKUP_RE.search(html_content):
+            return f'<p>{html.escape(html.unescape(html_content), quote=False)}</p>'
+        
+        # feedparser's sanitizer already produced clean markup, no need to reparse
+        if sanitized:
+            return html_content
+        
+        # Most content needs no cleaning, which the C lexbor parser can tell
+        # much faster than a full lxml parse and Cleaner pass
+        try:
+            markup = self._serialize_if_plain(html_content)
+        except Exception:
+            markup = None
+        if markup is not None:
+            return markup
+        
+        from lxml import etree
+        from lxml import html as lxml_html
+        
+        fragment = lxml_html.fragment_fromstring(html_content, create_parent='div')
+        _html_cleaner()(fragment)
+        # Serialize the cleaned children only, dropping the wrapper <div>
+        markup = etree.tostring(fragment, encoding='unicode', method='html')
+        return markup[len('<div>'):-len('</div>')]
+    
+    def _serialize_if_plain(self, html_content):
+        """
+        Parse content with selectolax and return it if it needs no cleaning.
+        
+        Returns:
+            Serialized body contents, or None if the content contains tags,
+            attributes or URLs that lxml's Cleaner would remove
+        """
+        from lxml.html import defs
+        from selectolax.lexbor import LexborHTMLParser
+        
+        tree = LexborHTMLParser(html_content)
+        # Elements moved into <head> (style, meta, ...) would be silently lost
+        if tree.head is not None and tree.head.child is not None:
+            return None
+        body = tree.body
+        if body is None:
+            return ''
+        
+        for node in body.traverse():
+            if node.tag not in _PLAIN_CONTENT_TAGS:
+                return None
+            for name, value in node.attributes.items():
+                if name not in defs.safe_attrs:
+                    return None
+                if value and name in defs.link_attrs and not _is_safe_link(value):
+                    return None
+        
+        return body.inner_html
     
     def _create_epub(self, post):
         """
@@ -64,6 +317,8 @@ class RSSToEpubConverter:
         Returns:
             Path to the created EPUB file
         """
+        from ebooklib import epub
+        
         # Create a new EPUB book
         book = epub.EpubBook()
         
@@ -73,15 +328,21 @@ class RSSToEpubConverter:
         
         # Get content from various possible fields
         content = ''
+        content_type = ''
         if 'content' in post:
             content = post.content[0].value
+            content_type = post.content[0].get('type', '')
         elif 'summary' in post:
             content = post.summary
+            content_type = post.get('summary_detail', {}).get('type', '')
         elif 'description' in post:
             content = post.description
         
         # Clean the content
-        content = self._clean_html_content(content)
+        content = self._clean_html_content(
+            content,
+            sanitized=content_type in _SANITIZED_TYPES
+        )
         
         # Set metadata
         book.set_identifier(post_id)
@@ -101,7 +362,7 @@ class RSSToEpubConverter:
             lang='en'
         )
         # Escape title for HTML to prevent malformed content
-        escaped_title = html.escape(title)
+        escaped_title = _escape_title(title)
         chapter.content = f'<h1>{escaped_title}</h1>{content}'
         
         # Add chapter to book
@@ -119,24 +380,102 @@ class RSSToEpubConverter:
         
         # Generate safe filename from title with unique identifier
         # Replace spaces with underscores, keep alphanumeric, hyphens, and underscores
-        safe_title = "".join(
-            c if c.isalnum() or c in ('-', '_') else '_' if c == ' ' else ''
-            for c in title
-        ).strip('_')
+        safe_title = _UNSAFE_FILENAME_RE.sub('', title.translate(_SPACE_TO_UNDERSCORE)).strip('_')
         safe_title = safe_title[:50]  # Limit length
         if not safe_title:
             safe_title = 'post'
         
         # Add hash of post_id to ensure uniqueness (16 chars for better collision resistance)
-        id_hash = hashlib.sha256(post_id.encode('utf-8')).hexdigest()[:16]
+        id_hash = _id_hash(post_id)
         filename = f"{safe_title}_{id_hash}.epub"
         
-        # Write EPUB file to output directory
-        filepath = os.path.join(self.output_dir, filename)
-        epub.write_epub(filepath, book)
+        # Write EPUB file to a subdirectory named after the first two hash
+        # characters, so no single directory grows to thousands of entries
+        dirpath = os.path.join(self.output_dir, id_hash[:2])
+        if dirpath not in self._known_dirs:
+            os.makedirs(dirpath, exist_ok=True)
+            self._known_dirs.add(dirpath)
+        filepath = os.path.join(dirpath, filename)
+        # Build the archive in memory, then move it into place atomically so a
+        # crash never leaves a partial EPUB behind
+        buffer = io.BytesIO()
+        epub.write_epub(buffer, book, {
+            'compresslevel': EPUB_COMPRESS_LEVEL,
+            'raise_exceptions': True,
+        })
+        tmp_filepath = f"{filepath}.tmp"
+        try:
+            with open(tmp_filepath, 'wb') as f:
+                f.write(buffer.getbuffer())
+            os.replace(tmp_filepath, filepath)
+        except OSError:
+            if os.path.exists(tmp_filepath):
+                os.remove(tmp_filepath)
+            raise
         
         return filepath
     
+    async def _fetch_feed(self, session):
+        """
+        Download and parse the feed, using a conditional request when possible.
+        
+        Args:
+            session: aiohttp.ClientSession used to download the feed
+        
+        Returns:
+            Tuple of (parsed feed, etag, modified); the parsed feed is None if
+            it has not changed since the last fetch or could not be downloaded
+        """
+        import asyncio
+        import aiohttp
+        import feedparser
+        
+        # Parsing is CPU-bound, so it runs in a worker thread to keep other
+        # downloads moving
+        loop = asyncio.get_running_loop()
+        
+        # feedparser reads local files and other non-HTTP sources itself
+        if not self.rss_url.startswith(('http://', 'https://')):
+            feed = await loop.run_in_executor(None, feedparser.parse, self.rss_url)
+            return feed, None, None
+        
+        # Let the server skip sending unchanged content
+        headers = {}
+        if self._etag:
+            headers['If-None-Match'] = self._etag
+        if self._modified:
+            headers['If-Modified-Since'] = self._modified
+        
+        try:
+            async with session.get(self.rss_url, headers=headers) as response:
+                if response.status == 304:
+                    print(f"Feed not modified since last check: {self.rss_url}")
+                    return None, None, None
+                if response.status >= 400:
+                    print(f"Error fetching feed {self.rss_url}: HTTP {response.status}")
+                    return None, None, None
+                content = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching feed {self.rss_url}: {str(e) or type(e).__name__}")
+            return None, None, None
+        
+        # feedparser uses the headers for encoding detection and, through
+        # Content-Location, to resolve relative links
+        response_headers = {name.lower(): value for name, value in response.headers.items()}
+        response_headers.setdefault('content-location', str(response.url))
+        feed = await loop.run_in_executor(
+            None,
+            functools.partial(feedparser.parse, content, response_headers=response_headers)
+        )
+        return feed, response.headers.get('ETag'), response.headers.get('Last-Modified')
+    
+    def _save_validators(self, etag, modified):
+        """Remember the cache validators returned with a fetched feed."""
+        self._etag = etag
+        self._modified = modified
+        if self._etag or self._modified:
+            self.history.set_validators(self.rss_url, self._etag, self._modified)
+    
     def process_feed(self):
         """
         Process the RSS feed and convert new posts to EPUB.
@@ -144,23 +483,50 @@ class RSSToEpubConverter:
         Returns:
             Number of new posts processed
         """
+        import asyncio
+        
+        return asyncio.run(self._process_feed_once())
+    
+    async def _process_feed_once(self):
+        """Process the feed with an HTTP session that only lives for this call."""
+        async with _create_http_session() as session:
+            return await self.process_feed_async(session)
+    
+    async def process_feed_async(self, session):
+        """
+        Process the RSS feed and convert new posts to EPUB.
+        
+        Args:
+            session: aiohttp.ClientSession used to download the feed
+        
+        Returns:
+            Number of new posts processed
+        """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
         print(f"Fetching RSS feed from: {self.rss_url}")
         
-        # Parse the RSS feed
-        feed = feedparser.parse(self.rss_url)
+        feed, etag, modified = await self._fetch_feed(session)
+        if feed is None:
+            return 0
         
         if feed.bozo:
-            print(f"Warning: Feed parsing encountered errors")
+            print(f"Warning: Feed parsing encountered errors in {self.rss_url}")
             if hasattr(feed, 'bozo_exception'):
                 print(f"Error: {feed.bozo_exception}")
         
         if not feed.entries:
-            print("No entries found in feed")
+            print(f"No entries found in feed {self.rss_url}")
+            self._save_validators(etag, modified)
             return 0
         
-        print(f"Found {len(feed.entries)} entries in feed")
+        print(f"Found {len(feed.entries)} entries in feed {self.rss_url}")
         
         new_posts_count = 0
+        failed_posts_count = 0
+        # IDs of posts converted in this run, saved in one batch at the end
+        new_post_ids = set()
         
         # Process each entry
         for entry in feed.entries:
@@ -172,7 +538,7 @@ class RSSToEpubConverter:
                 continue
             
             # Check if we've already processed this post
-            if post_id in self.seen_posts:
+            if post_id in new_post_ids or self.history.contains(self.rss_url, post_id):
                 print(f"Already processed: {entry.get('title', 'Unknown')}")
                 continue
             
@@ -180,21 +546,29 @@ class RSSToEpubConverter:
             print(f"Processing new post: {entry.get('title', 'Unknown')}")
             
             try:
-                epub_file = self._create_epub(entry)
+                # Cleaning and zipping run in a worker thread; the history
+                # database is only used from the event loop thread
+                epub_file = await loop.run_in_executor(None, self._create_epub, entry)
                 print(f"Created EPUB: {epub_file}")
                 
-                # Update in-memory set first, then save to file for better consistency
-                self.seen_posts.add(post_id)
-                self._save_post_id(post_id)
+                new_post_ids.add(post_id)
                 
                 new_posts_count += 1
                 
             except Exception as e:
                 print(f"Error creating EPUB for post '{entry.get('title', 'Unknown')}' (ID: {post_id}): {e}")
                 print(f"Skipping this post - it will be attempted again on the next run since it was not marked as processed.")
+                failed_posts_count += 1
                 continue
         
-        print(f"\nProcessed {new_posts_count} new post(s)")
+        if new_post_ids:
+            self.history.add(self.rss_url, new_post_ids)
+        
+        # Failed posts need a full fetch next time, so keep the old validators
+        if not failed_posts_count:
+            self._save_validators(etag, modified)
+        
+        print(f"\nProcessed {new_posts_count} new post(s) from {self.rss_url}")
         return new_posts_count
 
 
@@ -214,44 +588,65 @@ class RSSFeedMonitor:
         self.output_dir = output_dir
         self.poll_interval = poll_interval
         self.converters = {}
+        self.history = PostHistory()
         self.last_feed_list_mtime = None
+        self.last_feed_list_hash = None
         
         # Create output directory if it doesn't exist
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        os.makedirs(self.output_dir, exist_ok=True)
     
     def _load_feed_list(self):
         """Load the list of RSS feed URLs from the feed list file."""
-        if not os.path.exists(self.feed_list_file):
+        feeds = []
+        try:
+            with open(self.feed_list_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    # Skip empty lines and comments
+                    if line and not line.startswith('#'):
+                        feeds.append(line)
+        except FileNotFoundError:
             print(f"Warning: Feed list file '{self.feed_list_file}' not found.")
             return []
         
-        feeds = []
-        with open(self.feed_list_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines and comments
-                if line and not line.startswith('#'):
-                    feeds.append(line)
-        
         return feeds
     
+    def _get_feed_list_mtime(self):
+        """Return the feed list file's mtime in nanoseconds, or None if it is missing."""
+        try:
+            return os.stat(self.feed_list_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _get_feed_list_hash(self):
+        """Return a digest of the feed list file's contents, or None if it is missing."""
+        try:
+            with open(self.feed_list_file, 'rb') as f:
+                return hashlib.blake2b(f.read(), digest_size=16).digest()
+        except FileNotFoundError:
+            return None
+    
     def _check_feed_list_updated(self):
         """Check if the feed list file has been modified since last check."""
-        if not os.path.exists(self.feed_list_file):
+        current_mtime = self._get_feed_list_mtime()
+        if current_mtime is None:
             return False
         
-        current_mtime = os.path.getmtime(self.feed_list_file)
-        
         # Initialize on first call, but don't consider it an update
         if self.last_feed_list_mtime is None:
             self.last_feed_list_mtime = current_mtime
+            self.last_feed_list_hash = self._get_feed_list_hash()
             return False
         
         # Check if file has been modified
         if current_mtime > self.last_feed_list_mtime:
             self.last_feed_list_mtime = current_mtime
-            return True
+            # The mtime also changes on touch or a save without edits, so only
+            # report an update if the contents actually differ
+            current_hash = self._get_feed_list_hash()
+            if current_hash != self.last_feed_list_hash:
+                self.last_feed_list_hash = current_hash
+                return True
         
         return False
     
@@ -270,24 +665,34 @@ class RSSFeedMonitor:
         # Add new feeds
         new_feeds = current_feeds - existing_feeds
         for feed_url in new_feeds:
-            # Create a unique history file for each feed
-            feed_hash = hashlib.sha256(feed_url.encode('utf-8')).hexdigest()[:16]
+            # Per-feed history file used by older versions, imported if present
+            feed_hash = _id_hash(feed_url)
             history_file = f'seen_posts_{feed_hash}.txt'
             self.converters[feed_url] = RSSToEpubConverter(
                 feed_url, 
                 history_file=history_file,
-                output_dir=self.output_dir
+                output_dir=self.output_dir,
+                history=self.history
             )
             print(f"Added new feed: {feed_url}")
         
         # Remove feeds that are no longer in the list
         removed_feeds = existing_feeds - current_feeds
         for feed_url in removed_feeds:
-            del self.converters[feed_url]
+            self.converters.pop(feed_url).close()
             print(f"Removed feed: {feed_url}")
     
-    def run(self):
-        """Start the monitoring service."""
+    async def _poll_feed(self, session, feed_url, converter):
+        """Process one feed, reporting errors instead of raising them."""
+        try:
+            await converter.process_feed_async(session)
+        except Exception as e:
+            print(f"Error processing feed {feed_url}: {e}")
+    
+    async def run_async(self):
+        """Run the monitoring loop, downloading all feeds concurrently."""
+        import asyncio
+        
         print(f"RSS Feed Monitor started")
         print(f"Feed list file: {self.feed_list_file}")
         print(f"Output directory: {self.output_dir}")
@@ -295,8 +700,8 @@ class RSSFeedMonitor:
         print("-" * 60)
         
         # Initial load of feeds and set up the mtime tracking
-        if os.path.exists(self.feed_list_file):
-            self.last_feed_list_mtime = os.path.getmtime(self.feed_list_file)
+        self.last_feed_list_mtime = self._get_feed_list_mtime()
+        self.last_feed_list_hash = self._get_feed_list_hash()
         self._update_converters()
         
         if not self.converters:
@@ -307,7 +712,8 @@ class RSSFeedMonitor:
         print(f"\nMonitoring {len(self.converters)} feed(s)...")
         print("Press Ctrl+C to stop\n")
         
-        try:
+        # One session for the whole run, so connections are reused across polls
+        async with _create_http_session() as session:
             while True:
                 # Check if feed list has been updated and reload if needed
                 if self._check_feed_list_updated():
@@ -317,24 +723,32 @@ class RSSFeedMonitor:
                     # Skip to next iteration if there are no feeds
                     if not self.converters:
                         print(f"No feeds to monitor. Waiting for feed list...")
-                        time.sleep(self.poll_interval)
+                        await asyncio.sleep(self.poll_interval)
                         continue
                 
-                # Process each feed
+                # Downloads overlap, so a check takes about as long as the slowest feed
                 print(f"\n{time.strftime('%Y-%m-%d %H:%M:%S')} - Checking feeds...")
-                for feed_url, converter in self.converters.items():
-                    try:
-                        converter.process_feed()
-                    except Exception as e:
-                        print(f"Error processing feed {feed_url}: {e}")
+                await asyncio.gather(*(
+                    self._poll_feed(session, feed_url, converter)
+                    for feed_url, converter in self.converters.items()
+                ))
                 
                 # Wait before next check
                 print(f"\nWaiting {self.poll_interval} seconds until next check...")
-                time.sleep(self.poll_interval)
-                
+                await asyncio.sleep(self.poll_interval)
+    
+    def run(self):
+        """Start the monitoring service."""
+        import asyncio
+        
+        try:
+            asyncio.run(self.run_async())
         except KeyboardInterrupt:
             print("\n\nMonitoring stopped by user")
-
+        finally:
+            for converter in self.converters.values():
+                converter.close()
+            self.history.close()
 
 
 def main():
@@ -396,7 +810,10 @@ def main():
         output_dir = 'output'
         
         converter = RSSToEpubConverter(rss_url, output_dir=output_dir)
-        converter.process_feed()
+        try:
+            converter.process_feed()
+        finally:
+            converter.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,204 @@
+"""Tests for rss_to_epub."""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import feedparser
+
+from rss_to_epub import PostHistory, RSSFeedMonitor, RSSToEpubConverter
+
+
+FEED_XML = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title><link>http://example.com/</link>
+<item><title>First</title><guid>id-1</guid><description>One</description></item>
+<item><title>Second</title><guid>id-2</guid><description>Two</description></item>
+</channel></rss>
+"""
+
+
+class CleanHtmlContentTest(unittest.TestCase):
+    """Tests for _clean_html_content and its selectolax fast path, _serialize_if_plain."""
+    
+    def setUp(self):
+        # Cleaning does not use any feed or history state
+        self.converter = RSSToEpubConverter.__new__(RSSToEpubConverter)
+    
+    def test_unsafe_links_are_blanked(self):
+        """Obfuscated and non-http script URLs are removed like the Cleaner does."""
+        urls = (
+            'java&#9;script:alert(1)',
+            'jav&#x0A;ascript:alert(1)',
+            'vbscript:msgbox(1)',
+            'data:text/html,<script>alert(1)</script>',
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                html_content = f'<p><a href="{url}">link</a></p>'
+                self.assertIsNone(self.converter._serialize_if_plain(html_content))
+                self.assertEqual(
+                    self.converter._clean_html_content(html_content),
+                    '<p><a href="">link</a></p>'
+                )
+    
+    def test_safe_links_use_fast_path(self):
+        """Relative, http(s) and mailto links need no cleaning."""
+        for url in ('/posts/1', 'https://example.com/a?b=c', 'mailto:me@example.com'):
+            with self.subTest(url=url):
+                html_content = f'<p><a href="{url}">link</a></p>'
+                self.assertEqual(self.converter._serialize_if_plain(html_content), html_content)
+
+
+
+class TempDirTestCase(unittest.TestCase):
+    """Runs each test inside its own temporary working directory."""
+    
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = tmpdir.name
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmpdir)
+        self.db_file = os.path.join(self.tmpdir, 'seen.db')
+    
+    def open_history(self):
+        history = PostHistory(self.db_file)
+        self.addCleanup(history.close)
+        return history
+
+
+class PostHistoryTest(TempDirTestCase):
+    """Tests for PostHistory."""
+    
+    def test_add_and_contains(self):
+        """Added IDs are seen for their feed only, and duplicates are ignored."""
+        history = self.open_history()
+        history.add('feed-a', ['id-1', 'id-2'])
+        history.add('feed-a', ['id-2', 'id-2'])
+        
+        self.assertTrue(history.contains('feed-a', 'id-1'))
+        self.assertTrue(history.contains('feed-a', 'id-2'))
+        self.assertFalse(history.contains('feed-a', 'id-3'))
+        self.assertFalse(history.contains('feed-b', 'id-1'))
+        
+        with sqlite3.connect(self.db_file) as conn:
+            count, = conn.execute('SELECT COUNT(*) FROM seen').fetchone()
+        self.assertEqual(count, 2)
+    
+    def test_validators_survive_reopen(self):
+        """Stored ETag/Last-Modified values are read back after reopening the database."""
+        history = self.open_history()
+        self.assertEqual(history.get_validators('feed-a'), (None, None))
+        history.set_validators('feed-a', '"etag-1"', 'Mon, 01 Jan 2024 00:00:00 GMT')
+        history.close()
+        
+        history = self.open_history()
+        self.assertEqual(
+            history.get_validators('feed-a'),
+            ('"etag-1"', 'Mon, 01 Jan 2024 00:00:00 GMT')
+        )
+
+
+class LegacyHistoryImportTest(TempDirTestCase):
+    """Tests for importing text history files from older versions."""
+    
+    def write_history_file(self, name, post_ids):
+        with open(name, 'w', encoding='utf-8') as f:
+            f.writelines(f"{post_id}\n" for post_id in post_ids)
+    
+    def test_per_feed_file_is_imported_and_renamed(self):
+        """A monitor-mode history file is imported for its own feed only."""
+        self.write_history_file('seen_posts_abc.txt', ['id-1', 'id-2'])
+        history = self.open_history()
+        
+        RSSToEpubConverter('feed-a', history_file='seen_posts_abc.txt', history=history)
+        
+        self.assertTrue(history.contains('feed-a', 'id-1'))
+        self.assertTrue(history.contains('feed-a', 'id-2'))
+        self.assertFalse(history.contains('feed-b', 'id-1'))
+        self.assertFalse(os.path.exists('seen_posts_abc.txt'))
+        self.assertTrue(os.path.exists('seen_posts_abc.txt.migrated'))
+    
+    def test_shared_file_applies_to_every_feed(self):
+        """The single-feed seen_posts.txt keeps suppressing posts for all feeds."""
+        self.write_history_file('seen_posts.txt', ['id-1', 'id-2'])
+        history = self.open_history()
+        
+        RSSToEpubConverter('feed-a', history=history)
+        RSSToEpubConverter('feed-b', history=history)
+        
+        self.assertTrue(history.contains('feed-a', 'id-1'))
+        self.assertTrue(history.contains('feed-b', 'id-2'))
+        self.assertTrue(os.path.exists('seen_posts.txt.migrated'))
+
+
+class ProcessFeedValidatorsTest(TempDirTestCase):
+    """Tests for saving cache validators after processing a feed."""
+    
+    def process(self, create_epub):
+        history = self.open_history()
+        converter = RSSToEpubConverter('http://example.com/feed', history=history)
+        
+        async def fetch_feed(session):
+            return feedparser.parse(FEED_XML), '"etag-1"', 'modified-1'
+        
+        with mock.patch.object(converter, '_fetch_feed', fetch_feed), \
+                mock.patch.object(converter, '_create_epub', create_epub):
+            count = converter.process_feed()
+        return history, count
+    
+    def test_validators_saved_when_all_posts_succeed(self):
+        history, count = self.process(lambda post: 'book.epub')
+        
+        self.assertEqual(count, 2)
+        self.assertEqual(history.get_validators('http://example.com/feed'), ('"etag-1"', 'modified-1'))
+    
+    def test_validators_not_saved_when_a_post_fails(self):
+        """A failed post must be retried, so the next poll needs a full fetch."""
+        def create_epub(post):
+            if post.id == 'id-2':
+                raise OSError('disk full')
+            return 'book.epub'
+        
+        history, count = self.process(create_epub)
+        
+        self.assertEqual(count, 1)
+        self.assertEqual(history.get_validators('http://example.com/feed'), (None, None))
+        self.assertTrue(history.contains('http://example.com/feed', 'id-1'))
+        self.assertFalse(history.contains('http://example.com/feed', 'id-2'))
+
+
+class FeedListUpdateTest(TempDirTestCase):
+    """Tests for RSSFeedMonitor._check_feed_list_updated."""
+    
+    def setUp(self):
+        super().setUp()
+        self.feed_list_file = os.path.join(self.tmpdir, 'rss_feed.txt')
+        with open(self.feed_list_file, 'w', encoding='utf-8') as f:
+            f.write('http://example.com/feed\n')
+        self.monitor = RSSFeedMonitor(self.feed_list_file, output_dir=os.path.join(self.tmpdir, 'output'))
+        self.addCleanup(self.monitor.history.close)
+    
+    def bump_mtime(self):
+        mtime = os.stat(self.feed_list_file).st_mtime_ns + 10 ** 9
+        os.utime(self.feed_list_file, ns=(mtime, mtime))
+    
+    def test_touch_is_not_an_update(self):
+        self.assertFalse(self.monitor._check_feed_list_updated())
+        self.bump_mtime()
+        self.assertFalse(self.monitor._check_feed_list_updated())
+    
+    def test_edit_is_an_update(self):
+        self.assertFalse(self.monitor._check_feed_list_updated())
+        with open(self.feed_list_file, 'a', encoding='utf-8') as f:
+            f.write('http://example.com/other\n')
+        self.bump_mtime()
+        self.assertTrue(self.monitor._check_feed_list_updated())
+        # Reported once, not again on the next check
+        self.assertFalse(self.monitor._check_feed_list_updated())
+
+
+if __name__ == '__main__':
+    unittest.main()